@@ -5,150 +5,643 @@ A comprehensive agentic development environment with AI-powered code review
 """
 
 import os
+import re
 import sys
 import json
+import time
+import io
+import hashlib
+import sqlite3
 import argparse
+import queue
+import threading
 import subprocess
 import glob
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+# Literals found in a single scan of each file: (literal, kind, extension it
+# applies to or None). Issue kinds are reported at every occurrence; the rest
+# are signals for suggestions and scoring and only need to be seen once.
+SCAN_PATTERNS = [
+    (b'TODO', 'todo', None),
+    (b'FIXME', 'todo', None),
+    (b'"password"', 'secret', None),
+    (b'"secret"', 'secret', None),
+    (b'.unwrap()', 'unwrap', 'rs'),
+    (b'println!', 'println', 'rs'),
+    (b'use tracing::', 'tracing', None),
+    (b'def ', 'def', 'py'),
+]
+ISSUE_KINDS = frozenset({'todo', 'secret', 'unwrap'})
+
+# Issue kinds in report order, with their severity and message. Reviews store
+# an index into this table rather than the strings themselves.
+ISSUE_TYPES = (
+    ('todo', 'Medium', 'TODO or FIXME comment found'),
+    ('long_line', 'Low', 'Line too long (over 120 characters)'),
+    ('secret', 'High', 'Potential hardcoded secret found'),
+    ('unwrap', 'High', 'Unsafe unwrap() usage found'),
+)
+ISSUE_TYPE_IDS = {kind: i for i, (kind, _, _) in enumerate(ISSUE_TYPES)}
+
+# Suggestions are shared by every review that makes them, never copied
+SUGGESTIONS = {
+    'logging': {
+        'title': 'Use structured logging',
+        'description': 'Consider using a logging framework instead of println!',
+        'code': 'use tracing::{info, warn, error};',
+        'impact': 'Medium'
+    },
+    'error_handling': {
+        'title': 'Handle errors properly',
+        'description': 'Consider using proper error handling instead of unwrap()',
+        'code': '// Use .map_err() or ? operator instead',
+        'impact': 'High'
+    },
+    'type_hints': {
+        'title': 'Add type hints',
+        'description': 'Consider adding type annotations for better code clarity',
+        'code': 'from typing import List, Dict, Optional',
+        'impact': 'Medium'
+    },
+}
+# Shared suggestions by title, to map copies made elsewhere back to them
+SUGGESTION_KEYS = {suggestion['title']: key for key, suggestion in SUGGESTIONS.items()}
+
+def shared_suggestions(suggestions) -> Tuple[Dict, ...]:
+    return tuple(SUGGESTIONS[SUGGESTION_KEYS[suggestion['title']]] for suggestion in suggestions)
+
+# Directories never descended into when walking a codebase
+IGNORED_DIRS = frozenset({'.git', 'node_modules', 'target', 'dist', 'vendor'})
+
+# Generated or minified files are skipped: by name, by size, or when the
+# first line is longer than any hand-written one
+GENERATED_SUFFIXES = ('.min.js', 'bundle.js')
+MAX_FILE_SIZE = 1024 * 1024
+MAX_FIRST_LINE = 1000
+
+if njit is not None:
+    # SCAN_PATTERNS flattened into arrays the JIT kernel can index
+    _PATTERN_DATA = np.frombuffer(b''.join(literal for literal, _, _ in SCAN_PATTERNS), np.uint8)
+    _PATTERN_OFFSETS = np.cumsum([0] + [len(literal) for literal, _, _ in SCAN_PATTERNS]).astype(np.int64)
+    _PATTERN_IS_ISSUE = np.array([kind in ISSUE_KINDS for _, kind, _ in SCAN_PATTERNS])
+    
+    @njit(cache=True)
+    def scan_bytes(buf, enabled):
+        # Single pass over a uint8 buffer. Returns (line, offset, pattern id) rows
+        # for issue patterns, plus a per-pattern array of which patterns were seen.
+        # Pattern id -1 marks a line over 120 bytes, with offset at its start; the
+        # caller decodes it to confirm it is also over 120 characters.
+        num_patterns = _PATTERN_OFFSETS.shape[0] - 1
+        active = enabled.copy()
+        seen = np.zeros(num_patterns, np.bool_)
+        first_bytes = np.zeros(256, np.bool_)
+        for p in range(num_patterns):
+            if active[p]:
+                first_bytes[_PATTERN_DATA[_PATTERN_OFFSETS[p]]] = True
+        
+        hits = []
+        n = buf.shape[0]
+        line = 1
+        line_start = 0
+        for i in range(n):
+            b = buf[i]
+            if b == 10:
+                if i - line_start > 120:
+                    hits.append((line, line_start, -1))
+                line += 1
+                line_start = i + 1
+                continue
+            
+            if first_bytes[b]:
+                for p in range(num_patterns):
+                    if not active[p]:
+                        continue
+                    start = _PATTERN_OFFSETS[p]
+                    length = _PATTERN_OFFSETS[p + 1] - start
+                    if i + length > n:
+                        continue
+                    k = 0
+                    while k < length and buf[i + k] == _PATTERN_DATA[start + k]:
+                        k += 1
+                    if k == length:
+                        seen[p] = True
+                        if _PATTERN_IS_ISSUE[p]:
+                            hits.append((line, i, p))
+                        else:
+                            active[p] = False
+        
+        if n - line_start > 120:
+            hits.append((line, line_start, -1))
+        
+        result = np.empty((len(hits), 3), np.int64)
+        for j in range(len(hits)):
+            result[j, 0] = hits[j][0]
+            result[j, 1] = hits[j][1]
+            result[j, 2] = hits[j][2]
+        return result, seen
+else:
+    scan_bytes = None
 
 class CodeReview:
-    def __init__(self, file_path: str, issues: List[Dict], suggestions: List[Dict], score: float):
+    # Issues are held as parallel sequences of ISSUE_TYPES ids (one byte each),
+    # line numbers and code snippets; their dicts are only built when a review
+    # is written out. All are immutable, so the many issue-free reviews share
+    # the empty bytes and tuple. A review of an unreadable file carries just
+    # the error message.
+    __slots__ = ('file_path', 'issue_types', 'issue_lines', 'issue_codes', 'error',
+                 'suggestions', 'score', 'timestamp')
+    
+    def __init__(self, file_path: str, issue_types: bytes, issue_lines: Tuple[int, ...],
+                 issue_codes: Tuple[str, ...], suggestions: Tuple[Dict, ...], score: float,
+                 error: Optional[str] = None):
         self.file_path = file_path
-        self.issues = issues
+        self.issue_types = issue_types
+        self.issue_lines = issue_lines
+        self.issue_codes = issue_codes
+        self.error = error
         self.suggestions = suggestions
         self.score = score
         self.timestamp = datetime.utcnow()
+    
+    @property
+    def issue_count(self) -> int:
+        return len(self.issue_types) if self.error is None else 1
+    
+    @property
+    def issues(self) -> List[Dict]:
+        if self.error is not None:
+            return [{'severity': 'Critical', 'message': self.error, 'line': None, 'code': None}]
+        return issue_dicts(self.issue_types, self.issue_lines, self.issue_codes)
+
+def issue_dicts(issue_types: bytes, issue_lines: Tuple[int, ...], issue_codes: Tuple[str, ...]) -> List[Dict]:
+    issues = []
+    for type_id, line, code in zip(issue_types, issue_lines, issue_codes):
+        _, severity, message = ISSUE_TYPES[type_id]
+        issues.append({
+            'severity': severity,
+            'message': message,
+            'line': line,
+            'code': code
+        })
+    return issues
+
+class ReviewCache:
+    # Bump when analysis rules change so stale results are dropped
+    VERSION = 8
+    
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.pending = []
+        
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+            self.conn.execute('DROP TABLE IF EXISTS reviews')
+            self.conn.execute(f'PRAGMA user_version = {self.VERSION}')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS reviews (
+                sha BLOB NOT NULL,
+                suffix TEXT NOT NULL,
+                path TEXT,
+                issues_json BLOB,
+                suggestions_json BLOB,
+                score REAL,
+                PRIMARY KEY (sha, suffix)
+            )
+        ''')
+        self.conn.commit()
+    
+    @staticmethod
+    def default_path() -> Path:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        return Path(cache_home) / 'devagent' / 'reviews.db'
+    
+    def get(self, digest: bytes, file_path: Path) -> Optional[CodeReview]:
+        # Results depend on the file extension as well as the content
+        row = self.conn.execute(
+            'SELECT issues_json, suggestions_json, score FROM reviews WHERE sha = ? AND suffix = ?',
+            (digest, file_path.suffix)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        issue_types, issue_lines, issue_codes = json.loads(row[0])
+        return CodeReview(
+            file_path=str(file_path),
+            issue_types=bytes(issue_types),
+            issue_lines=tuple(issue_lines),
+            issue_codes=tuple(issue_codes),
+            suggestions=tuple(SUGGESTIONS[key] for key in json.loads(row[1])),
+            score=row[2]
+        )
+    
+    def add(self, digest: bytes, review: CodeReview) -> None:
+        # Errors are not a property of the content, so they are never cached
+        if review.error is not None:
+            return
+        
+        issues = [list(review.issue_types), review.issue_lines, review.issue_codes]
+        self.pending.append((
+            digest,
+            Path(review.file_path).suffix,
+            review.file_path,
+            json.dumps(issues).encode('utf-8'),
+            # Suggestions are stored by SUGGESTIONS key and shared again on read
+            json.dumps([SUGGESTION_KEYS[suggestion['title']] for suggestion in review.suggestions]).encode('utf-8'),
+            review.score
+        ))
+    
+    def commit(self) -> None:
+        # Write all new results in a single transaction
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?)', self.pending)
+        self.pending = []
+    
+    def close(self) -> None:
+        self.conn.close()
 
 class DevAgent:
     def __init__(self, args):
         self.args = args
-        self.code_extensions = ['.rs', '.js', '.ts', '.py', '.java', '.cpp', '.c', '.go', '.php']
+        self.code_extensions = frozenset({'.rs', '.js', '.ts', '.py', '.java', '.cpp', '.c', '.go', '.php'})
+        # Language-specific suggestion checks, keyed by extension without the dot
+        self._suggesters = {
+            'rs': self._rust_suggestions,
+            'py': self._python_suggestions,
+        }
+        # Opened for the duration of review_codebase only, never in worker processes
+        self._cache: Optional[ReviewCache] = None
+        # Results of the last walk, and outputs written from them, for reuse across steps.
+        # The generation changes whenever the results do.
+        self._reviews: Optional[List[CodeReview]] = None
+        self._reviews_generation = 0
+        self._last_walk_mtime = 0.0
+        self._written_files: List[str] = []
+        # Set while watching the tree: files changed since the last review, or
+        # None when a directory changed and everything must be walked again
+        self._observer = None
+        self._changed_lock = threading.Lock()
+        self._changed_paths: Optional[Set[str]] = set()
+        
+        self._scan_db = self._build_scan_db()
+        self._enabled_patterns: Dict[str, List[bool]] = {}
+    
+    def _build_scan_db(self) -> Optional[Any]:
+        # Hyperscan database of SCAN_PATTERNS, scanned in block mode.
+        # Signal patterns only need their first match reported.
+        if hyperscan is None:
+            return None
+        
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[re.escape(literal) for literal, _, _ in SCAN_PATTERNS],
+                ids=list(range(len(SCAN_PATTERNS))),
+                elements=len(SCAN_PATTERNS),
+                flags=[hyperscan.HS_FLAG_SOM_LEFTMOST if kind in ISSUE_KINDS else hyperscan.HS_FLAG_SINGLEMATCH
+                       for _, kind, _ in SCAN_PATTERNS]
+            )
+        except hyperscan.error as e:
+            print(f"Hyperscan unavailable, falling back to literal search: {e}")
+            return None
+        
+        return db
+    
+    def _patterns_for(self, ext: str) -> List[bool]:
+        # Which SCAN_PATTERNS apply to files with this extension
+        enabled = self._enabled_patterns.get(ext)
+        if enabled is None:
+            enabled = [pattern_ext is None or pattern_ext == ext for _, _, pattern_ext in SCAN_PATTERNS]
+            self._enabled_patterns[ext] = enabled
+        return enabled
+    
+    def _scan_patterns(self, content: bytes, enabled: List[bool]) -> Tuple[List[Tuple[int, str]], Set[str]]:
+        # Returns (offset, kind) for every issue pattern match, and the set of kinds seen
+        matches = []
+        signals = set()
         
+        if self._scan_db is not None:
+            def on_match(pattern_id, start, end, flags, context):
+                if enabled[pattern_id]:
+                    kind = SCAN_PATTERNS[pattern_id][1]
+                    signals.add(kind)
+                    if kind in ISSUE_KINDS:
+                        matches.append((start, kind))
+            
+            self._scan_db.scan(content, match_event_handler=on_match)
+            return matches, signals
+        
+        # Without Hyperscan, search each literal separately: bytes.find runs a
+        # fast substring search, while an re alternation steps through every byte.
+        # For this handful of literals it also beats a pyahocorasick automaton,
+        # whose per-match Python iteration made it about 2x slower.
+        for (literal, kind, _), pattern_enabled in zip(SCAN_PATTERNS, enabled):
+            if not pattern_enabled:
+                continue
+            pos = content.find(literal)
+            if pos != -1:
+                signals.add(kind)
+            if kind not in ISSUE_KINDS:
+                continue
+            while pos != -1:
+                matches.append((pos, kind))
+                pos = content.find(literal, pos + 1)
+        return matches, signals
+    
     def is_code_file(self, file_path: Path) -> bool:
         return file_path.suffix.lower() in self.code_extensions
     
-    def analyze_code(self, content: str, file_path: str) -> List[Dict]:
-        issues = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Check for TODO comments
-            if 'TODO' in line or 'FIXME' in line:
-                issues.append({
-                    'severity': 'Medium',
-                    'message': 'TODO or FIXME comment found',
-                    'line': i,
-                    'code': line.strip()
-                })
-            
-            # Check for long lines
-            if len(line) > 120:
-                issues.append({
-                    'severity': 'Low',
-                    'message': 'Line too long (over 120 characters)',
-                    'line': i,
-                    'code': line.strip()
-                })
+    def _line_at(self, content: bytes, offset: int) -> str:
+        # Decode just the line containing offset, without its line ending
+        start = content.rfind(b'\n', 0, offset) + 1
+        end = content.find(b'\n', offset)
+        if end == -1:
+            end = len(content)
+        return content[start:end].decode('utf-8', 'replace')
+    
+    def analyze_code(self, content: bytes, ext: str) -> List[Dict]:
+        return issue_dicts(*self.scan_all(content, ext)[0])
+    
+    def scan_all(self, content: bytes, ext: str) -> Tuple[Tuple[bytes, Tuple[int, ...], Tuple[str, ...]], Set[str]]:
+        # One scan yields the issues, as (type ids, lines, codes) sequences for
+        # CodeReview, plus the signals read by suggestions and scoring
+        enabled = self._patterns_for(ext)
+        
+        # Split lines as the original text-mode reads did: universal newlines
+        # end a line at \r\n and at a lone \r as well as at \n
+        if b'\r' in content:
+            content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        hits = {}
+        
+        if self._scan_db is None and scan_bytes is not None:
+            # JIT kernel finds pattern matches, line numbers and long lines in one pass
+            rows, seen = scan_bytes(np.frombuffer(content, np.uint8), np.array(enabled))
+            signals = {kind for (_, kind, _), found in zip(SCAN_PATTERNS, seen.tolist()) if found}
+            for i, offset, pattern_id in rows.tolist():
+                if pattern_id < 0:
+                    # Count characters exactly as the fallback below does, so
+                    # invalid UTF-8 gives the same result on either path
+                    code = self._line_at(content, offset)
+                    if len(code) > 120:
+                        hits[(i, ISSUE_TYPE_IDS['long_line'])] = code
+                    continue
+                type_id = ISSUE_TYPE_IDS[SCAN_PATTERNS[pattern_id][1]]
+                if (i, type_id) not in hits:
+                    hits[(i, type_id)] = self._line_at(content, offset)
+        else:
+            # Check for TODOs, hardcoded secrets and unwrap() in Rust
+            matches, signals = self._scan_patterns(content, enabled)
             
-            # Check for hardcoded secrets
-            if '"password"' in line or '"secret"' in line:
-                issues.append({
-                    'severity': 'High',
-                    'message': 'Potential hardcoded secret found',
-                    'line': i,
-                    'code': line.strip()
-                })
+            # Line numbers come from counting newlines between consecutive matches
+            line, pos = 1, 0
+            for offset, kind in sorted(matches):
+                line += content.count(b'\n', pos, offset)
+                pos = offset
+                type_id = ISSUE_TYPE_IDS[kind]
+                if (line, type_id) not in hits:
+                    hits[(line, type_id)] = self._line_at(content, offset)
             
-            # Check for unwrap() in Rust
-            if '.unwrap()' in line and file_path.endswith('.rs'):
-                issues.append({
-                    'severity': 'High',
-                    'message': 'Unsafe unwrap() usage found',
-                    'line': i,
-                    'code': line.strip()
-                })
-        
-        return issues
-    
-    def generate_suggestions(self, content: str, file_path: str) -> List[Dict]:
+            # Check for long lines; byte length only bounds the character length
+            lines = content.split(b'\n')
+            if max(map(len, lines)) > 120:
+                for i, line_bytes in enumerate(lines, 1):
+                    if len(line_bytes) > 120:
+                        code = line_bytes.decode('utf-8', 'replace')
+                        if len(code) > 120:
+                            hits[(i, ISSUE_TYPE_IDS['long_line'])] = code
+        
+        # Keys sort by line, then by ISSUE_TYPES order
+        keys = sorted(hits)
+        issue_types = bytes(type_id for _, type_id in keys)
+        issue_lines = tuple(i for i, _ in keys)
+        issue_codes = tuple(hits[key].strip() for key in keys)
+        
+        return (issue_types, issue_lines, issue_codes), signals
+    
+    def generate_suggestions(self, signals: Set[str], ext: str) -> Tuple[Dict, ...]:
+        suggester = self._suggesters.get(ext)
+        return suggester(signals) if suggester else ()
+    
+    def _rust_suggestions(self, signals: Set[str]) -> Tuple[Dict, ...]:
         suggestions = []
         
         # Suggest structured logging
-        if 'println!' in content and file_path.endswith('.rs'):
-            suggestions.append({
-                'title': 'Use structured logging',
-                'description': 'Consider using a logging framework instead of println!',
-                'code': 'use tracing::{info, warn, error};',
-                'impact': 'Medium'
-            })
+        if 'println' in signals:
+            suggestions.append(SUGGESTIONS['logging'])
         
         # Suggest proper error handling
-        if '.unwrap()' in content and file_path.endswith('.rs'):
-            suggestions.append({
-                'title': 'Handle errors properly',
-                'description': 'Consider using proper error handling instead of unwrap()',
-                'code': '// Use .map_err() or ? operator instead',
-                'impact': 'High'
-            })
+        if 'unwrap' in signals:
+            suggestions.append(SUGGESTIONS['error_handling'])
         
+        return tuple(suggestions)
+    
+    def _python_suggestions(self, signals: Set[str]) -> Tuple[Dict, ...]:
         # Suggest type annotations for Python
-        if file_path.endswith('.py') and 'def ' in content:
-            suggestions.append({
-                'title': 'Add type hints',
-                'description': 'Consider adding type annotations for better code clarity',
-                'code': 'from typing import List, Dict, Optional',
-                'impact': 'Medium'
-            })
-        
-        return suggestions
+        if 'def' in signals:
+            return (SUGGESTIONS['type_hints'],)
+        return ()
     
-    def calculate_score(self, content: str, issues: List[Dict]) -> float:
+    def calculate_score(self, signals: Set[str], issue_count: int) -> float:
         score = 1.0
-        lines = content.split('\n')
-        total_lines = len(lines)
-        
-        if total_lines == 0:
-            return 1.0
         
         # Deduct points for issues
-        issue_penalty = len(issues) * 0.1
+        issue_penalty = issue_count * 0.1
         score -= min(issue_penalty, 0.5)  # Cap at 50% penalty
         
-        # Bonus for good practices
-        if 'use tracing::' in content:
-            score += 0.1
-        if 'Result<' in content and str(3
-    ).endswith('.rs'):
+        # Bonus for good practices. The original Result< bonus sat behind a
+        # check that was always false, so it never applied and is not scanned for.
+        if 'tracing' in signals:
             score += 0.1
         
         return max(0.0, min(1.0, score))
     
-    def review_file(self, file_path: Path) -> CodeReview:
+    def _read_source(self, file_path: Path) -> Tuple[Optional[bytes], Optional[bytes]]:
+        # One read serves both the cache key and the analysis; sha256 over the
+        # in-memory buffer uses OpenSSL's SHA-NI path and releases the GIL, so
+        # it never needs the file_digest() re-read.
+        # Returns no data for minified files, which are not worth scanning.
+        # Their first line has no break, which as in scan_all may be a lone \r.
+        data = file_path.read_bytes()
+        if (len(data) > MAX_FIRST_LINE and data.find(b'\n', 0, MAX_FIRST_LINE + 1) == -1
+                and data.find(b'\r', 0, MAX_FIRST_LINE + 1) == -1):
+            return None, None
+        digest = hashlib.sha256(data).digest() if self._cache is not None else None
+        return data, digest
+    
+    def review_file(self, file_path: Path) -> Optional[CodeReview]:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            data, digest = self._read_source(file_path)
+        except Exception as e:
+            return self._error_review(file_path, e)
+        
+        if data is None:
+            print(f"Skipping minified file: {file_path}")
+            return None
+        
+        if digest is None:
+            return self.review_content(file_path, data)
+        
+        review = self._cache.get(digest, file_path)
+        if review is None:
+            review = self.review_content(file_path, data)
+            self._cache.add(digest, review)
+        return review
+    
+    def review_content(self, file_path: Path, data: bytes) -> CodeReview:
+        try:
+            # Extension without the dot, matched case-sensitively like endswith() was
+            ext = file_path.suffix[1:]
             
-            issues = self.analyze_code(content, str(file_path))
-            suggestions = self.generate_suggestions(content, str(file_path))
-            score = self.calculate_score(content, issues)
+            # All patterns are ASCII, so the file is never decoded as a whole;
+            # only lines quoted in issues are, leniently, in _line_at
+            (issue_types, issue_lines, issue_codes), signals = self.scan_all(data, ext)
+            suggestions = self.generate_suggestions(signals, ext)
+            score = self.calculate_score(signals, len(issue_types))
             
             return CodeReview(
                 file_path=str(file_path),
-                issues=issues,
+                issue_types=issue_types,
+                issue_lines=issue_lines,
+                issue_codes=issue_codes,
                 suggestions=suggestions,
                 score=score
             )
         except Exception as e:
-            print(f"Error reviewing {file_path}: {e}")
-            return CodeReview(
-                file_path=str(file_path),
-                issues=[{'severity': 'Critical', 'message': f'Error reading file: {e}', 'line': None, 'code': None}],
-                suggestions=[],
-                score=0.0
-            )
+            return self._error_review(file_path, e)
+    
+    def _error_review(self, file_path: Path, error: Exception) -> CodeReview:
+        print(f"Error reviewing {file_path}: {error}")
+        return CodeReview(
+            file_path=str(file_path),
+            issue_types=b'',
+            issue_lines=(),
+            issue_codes=(),
+            suggestions=(),
+            score=0.0,
+            error=f'Error reading file: {error}'
+        )
+    
+    def walk_code_files(self, root: Path, workers: int = 8) -> Iterator[str]:
+        # Parallel os.scandir walk: threads pull directories from a shared queue
+        # and only code files, filtered on the dirent name, are yielded as str paths.
+        dir_queue = queue.Queue()
+        found = queue.Queue()
+        stop = threading.Event()
+        lock = threading.Lock()
+        pending_dirs = 1
+        
+        def scan(directory: str) -> None:
+            nonlocal pending_dirs
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in IGNORED_DIRS:
+                                    with lock:
+                                        pending_dirs += 1
+                                    dir_queue.put(entry.path)
+                            elif (os.path.splitext(entry.name)[1].lower() in self.code_extensions
+                                  and not entry.name.endswith(GENERATED_SUFFIXES)
+                                  and entry.is_file()
+                                  and entry.stat().st_size <= MAX_FILE_SIZE):
+                                found.put(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            finally:
+                with lock:
+                    pending_dirs -= 1
+                    if pending_dirs == 0:
+                        found.put(None)
+        
+        def worker() -> None:
+            while not stop.is_set():
+                directory = dir_queue.get()
+                if directory is None:
+                    return
+                scan(directory)
+        
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        dir_queue.put(str(root))
+        
+        try:
+            while True:
+                file_path = found.get()
+                if file_path is None:
+                    break
+                yield file_path
+        finally:
+            stop.set()
+            for _ in threads:
+                dir_queue.put(None)
+    
+    def _read_files(self, path: Path, read_queue: queue.Queue, stop: threading.Event) -> None:
+        # Producer: walk the tree and read candidate files on a thread pool.
+        # The bounded queue blocks readers when analysis falls behind; once
+        # stop is set they give up instead, so a failed consumer never leaves
+        # them blocked (and interpreter exit waiting on them).
+        def put(item) -> None:
+            while not stop.is_set():
+                try:
+                    read_queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+        
+        def read(index: int, file_path: Path) -> None:
+            if stop.is_set():
+                return
+            try:
+                data, digest = self._read_source(file_path)
+                put((index, file_path, data, digest, None))
+            except Exception as e:
+                put((index, file_path, None, None, e))
+        
+        readers = ThreadPoolExecutor(max_workers=16)
+        try:
+            for index, file_path in enumerate(self.walk_code_files(path)):
+                if stop.is_set():
+                    break
+                readers.submit(read, index, Path(file_path))
+        finally:
+            readers.shutdown(cancel_futures=stop.is_set())
+            put(None)
     
     def review_codebase(self) -> List[CodeReview]:
         print(f"Starting codebase review of: {self.args.path}")
@@ -160,74 +653,295 @@ class DevAgent:
             print(f"Path {self.args.path} does not exist!")
             return reviews
         
-        # Walk through all files
-        for file_path in path.rglob('*'):
-            if file_path.is_file() and self.is_code_file(file_path):
-                print(f"Reviewing: {file_path}")
-                review = self.review_file(file_path)
-                reviews.append(review)
+        jobs = self.args.jobs or os.cpu_count() or 1
+        walk_mtime = time.time()
+        # Changes seen from here on may be missed by the walk, so they stay pending
+        with self._changed_lock:
+            self._changed_paths = set()
+        self._cache = self._open_cache()
+        
+        try:
+            if jobs == 1:
+                for file_path in self.walk_code_files(path):
+                    print(f"Reviewing: {file_path}")
+                    review = self.review_file(Path(file_path))
+                    if review is not None:
+                        reviews.append(review)
+            else:
+                reviews = self._review_pipelined(path, jobs)
+            
+            # The parallel walk has no fixed order, so sort for stable output
+            reviews.sort(key=lambda review: review.file_path)
+            
+            if self._cache is not None:
+                self._cache.commit()
+        finally:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+        
+        self._reviews = reviews
+        self._reviews_generation += 1
+        self._last_walk_mtime = walk_mtime
         
         print(f"Completed codebase review. Found {len(reviews)} files to review.")
         return reviews
     
+    def last_reviews(self) -> List[CodeReview]:
+        if self._reviews is not None:
+            if self._observer is not None:
+                # The watcher knows exactly which files changed; re-review only those
+                with self._changed_lock:
+                    changed = self._changed_paths
+                    self._changed_paths = set()
+                if changed is not None:
+                    if changed:
+                        self._refresh_reviews(changed)
+                    return self._reviews
+            else:
+                # Reuse the last walk unless a reviewed file changed after it started.
+                # Stat-ing the known files is far cheaper than walking and reading again.
+                try:
+                    if all(os.stat(r.file_path).st_mtime < self._last_walk_mtime for r in self._reviews):
+                        return self._reviews
+                except OSError:
+                    pass
+        
+        return self.review_codebase()
+    
+    def _refresh_reviews(self, changed: Set[str]) -> None:
+        reviews = {review.file_path: review for review in self._reviews}
+        self._cache = self._open_cache()
+        
+        try:
+            for file_path in sorted(changed):
+                reviews.pop(file_path, None)
+                if self._is_reviewable(file_path):
+                    print(f"Reviewing: {file_path}")
+                    review = self.review_file(Path(file_path))
+                    if review is not None:
+                        reviews[file_path] = review
+            
+            if self._cache is not None:
+                self._cache.commit()
+        finally:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+        
+        self._reviews = sorted(reviews.values(), key=lambda review: review.file_path)
+        self._reviews_generation += 1
+        print(f"Updated {len(changed)} changed files.")
+    
+    def _is_reviewable(self, file_path: str) -> bool:
+        # The walk's filters, applied to a single path below the reviewed root
+        rel_path = os.path.relpath(file_path, self.args.path)
+        if any(part in IGNORED_DIRS for part in Path(rel_path).parts[:-1]):
+            return False
+        if not self.is_code_file(Path(file_path)) or file_path.endswith(GENERATED_SUFFIXES):
+            return False
+        try:
+            return os.path.isfile(file_path) and os.path.getsize(file_path) <= MAX_FILE_SIZE
+        except OSError:
+            return False
+    
+    def watch_changes(self) -> bool:
+        # Track changes under the reviewed path with watchdog, when installed
+        if Observer is None or self._observer is not None:
+            return self._observer is not None
+        
+        try:
+            observer = Observer()
+            observer.schedule(_ChangeHandler(self), str(Path(self.args.path)), recursive=True)
+            observer.start()
+        except OSError as e:
+            print(f"Not watching for changes: {e}")
+            return False
+        
+        self._observer = observer
+        return True
+    
+    def stop_watching(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+    
+    def _note_change(self, file_path: Optional[str]) -> None:
+        # A None path invalidates every result; outputs such as patches.diff are ignored
+        if file_path is not None and not self.is_code_file(Path(file_path)):
+            return
+        with self._changed_lock:
+            if file_path is None:
+                self._changed_paths = None
+            elif self._changed_paths is not None:
+                self._changed_paths.add(file_path)
+    
+    def _open_cache(self) -> Optional[ReviewCache]:
+        if self.args.no_cache:
+            return None
+        
+        try:
+            return ReviewCache(ReviewCache.default_path())
+        except (OSError, sqlite3.Error) as e:
+            print(f"Review cache unavailable: {e}")
+            return None
+    
+    def _review_pipelined(self, path: Path, jobs: int) -> List[CodeReview]:
+        # Consumer: batch file contents from the reader threads into worker processes.
+        # A batch is flushed when full or when the readers have nothing queued,
+        # so slow I/O never leaves the workers idle.
+        read_queue = queue.Queue(maxsize=64)
+        stop = threading.Event()
+        reader = threading.Thread(target=self._read_files, args=(path, read_queue, stop), daemon=True)
+        
+        results = {}
+        digests = {}
+        pending = set()
+        batch = []
+        
+        def collect(done) -> None:
+            for future in done:
+                for index, review in future.result():
+                    # Unpickled suggestions are copies; keep the shared ones instead
+                    review.suggestions = shared_suggestions(review.suggestions)
+                    results[index] = review
+                    if index in digests:
+                        self._cache.add(digests.pop(index), results[index])
+        
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_review_worker,
+                                 initargs=(self.args,)) as executor:
+            # Workers are forked on submit; fork them all before the reader,
+            # walker and pool threads exist, so no child inherits a lock one
+            # of those threads was holding
+            for _ in range(jobs):
+                executor.submit(int)
+            reader.start()
+            
+            try:
+                while True:
+                    item = read_queue.get()
+                    if item is not None:
+                        index, file_path, data, digest, error = item
+                        print(f"Reviewing: {file_path}")
+                        cached = self._cache.get(digest, file_path) if digest is not None else None
+                        if error is not None:
+                            results[index] = self._error_review(file_path, error)
+                        elif data is None:
+                            print(f"Skipping minified file: {file_path}")
+                        elif cached is not None:
+                            results[index] = cached
+                        else:
+                            if digest is not None:
+                                digests[index] = digest
+                            batch.append((index, str(file_path), data))
+                    
+                    if batch and (item is None or len(batch) >= 32 or read_queue.empty()):
+                        pending.add(executor.submit(review_batch_worker, batch))
+                        batch = []
+                        if len(pending) >= jobs * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                    
+                    if item is None:
+                        break
+                
+                collect(wait(pending).done)
+            finally:
+                # Stop the readers and free any blocked on the full queue
+                stop.set()
+                for future in pending:
+                    future.cancel()
+                try:
+                    while True:
+                        read_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                reader.join()
+        
+        return [results[index] for index in sorted(results)]
+    
     def save_reviews(self, reviews: List[CodeReview]) -> None:
         output_path = self.args.output or Path('code_review_results.json')
         
-        # Convert reviews to JSON-serializable format
-        reviews_data = []
-        for review in reviews:
-            reviews_data.append({
-                'file_path': review.file_path,
-                'issues': review.issues,
-                'suggestions': review.suggestions,
-                'score': review.score,
-                'timestamp': review.timestamp.isoformat()
-            })
-        
-        with open(output_path, 'w') as f:
-            json.dump(reviews_data, f, indent=2)
+        # Stream one review at a time, indented to match json.dump(..., indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(b'[')
+            for i, review in enumerate(reviews):
+                f.write(b',\n  ' if i else b'\n  ')
+                f.write(self._encode_review(review).replace(b'\n', b'\n  '))
+            f.write(b'\n]' if reviews else b']')
+        self._written_files.append(str(output_path))
         
         print(f"Review results saved to: {output_path}")
     
+    def _encode_review(self, review: CodeReview) -> bytes:
+        review_data = {
+            'file_path': review.file_path,
+            'issues': review.issues,
+            'suggestions': review.suggestions,
+            'score': review.score,
+            'timestamp': review.timestamp
+        }
+        
+        if orjson is not None:
+            # orjson serializes datetime natively, in the same format as isoformat()
+            return orjson.dumps(review_data, option=orjson.OPT_INDENT_2)
+        
+        review_data['timestamp'] = review.timestamp.isoformat()
+        return json.dumps(review_data, indent=2).encode('utf-8')
+    
     def generate_patches(self, reviews: List[CodeReview]) -> None:
         print("Generating patches for suggested improvements...")
         
+        # Build one unified diff in memory and write it with a single call;
+        # each file gets one hunk inserting its suggestions at the top.
+        patch_name = 'patches.diff'
+        buf = io.StringIO()
+        patch_count = 0
+        
         for review in reviews:
-            for suggestion in review.suggestions:
-                if suggestion.get('code'):
-                    # Create patch filename
-                    safe_filename = review.file_path.replace('/', '_').replace('\\', '_')
-                    safe_title = suggestion['title'].replace(' ', '_')
-                    patch_name = f"{safe_filename}_{safe_title}.patch"
-                    
-                    # Create patch content
-                    patch_content = f"""--- {review.file_path}
-+++ {review.file_path}
-@@ -1,1 +1,1 @@
-{suggestion['code']}
-"""
-                    
-                    with open(patch_name, 'w') as f:
-                        f.write(patch_content)
-                    
-                    print(f"Generated patch: {patch_name}")
+            codes = [suggestion['code'] for suggestion in review.suggestions if suggestion.get('code')]
+            if not codes:
+                continue
+            
+            buf.write(f"--- {review.file_path}\n+++ {review.file_path}\n")
+            buf.write(f"@@ -0,0 +1,{len(codes)} @@\n")
+            for code in codes:
+                buf.write(f"+{code}\n")
+            patch_count += len(codes)
+        
+        if patch_count:
+            Path(patch_name).write_text(buf.getvalue())
+            self._written_files.append(patch_name)
+            print(f"Generated patch: {patch_name} ({patch_count} suggestions)")
+        elif os.path.exists(patch_name):
+            # Empty an earlier run's patch rather than leave stale suggestions
+            # to be applied; truncating lets a committed copy be updated too
+            Path(patch_name).write_text('')
+            self._written_files.append(patch_name)
+            print(f"Cleared stale patch: {patch_name}")
     
-    def commit_changes(self) -> None:
+    def commit_changes(self, reviews: Optional[List[CodeReview]] = None) -> None:
         print("Committing changes to git...")
         
+        if reviews is None:
+            reviews = self._reviews
+        # Stage only reviewed files and generated outputs so git need not rescan the tree
+        paths = [r.file_path for r in reviews or []] + self._written_files
+        message = 'Auto-generated code improvements from DevAgent'
+        
         try:
-            # Git add
-            result = subprocess.run(['git', 'add', '.'], capture_output=True, text=True)
-            if result.returncode != 0:
-                print("Git add failed")
-                return
-            
-            # Git commit
-            result = subprocess.run([
-                'git', 'commit', '-m', 'Auto-generated code improvements from DevAgent'
-            ], capture_output=True, text=True)
+            if pygit2 is not None:
+                committed = self._commit_with_pygit2(paths, message)
+            else:
+                committed = self._commit_with_git(paths, message)
+                if committed is None:
+                    print("Git add failed")
+                    return
             
-            if result.returncode == 0:
+            if committed:
+                self._written_files = []
                 print("Changes committed successfully")
             else:
                 print("Git commit failed - no changes to commit")
@@ -235,33 +949,184 @@ class DevAgent:
         except Exception as e:
             print(f"Git operation failed: {e}")
     
+    def _commit_with_pygit2(self, paths: List[str], message: str) -> bool:
+        # Update the index in-process: no git fork and no full working tree scan
+        repo_path = pygit2.discover_repository(os.getcwd())
+        if repo_path is None:
+            raise pygit2.GitError('not a git repository')
+        repo = pygit2.Repository(repo_path)
+        workdir = Path(repo.workdir).resolve()
+        
+        index = repo.index
+        index.read()
+        if paths:
+            # Like `git add .`, skip files outside the worktree or ignored
+            for path in paths:
+                rel_path = self._repo_relative(path, workdir)
+                if rel_path is not None and not repo.path_is_ignored(rel_path):
+                    index.add(rel_path)
+        else:
+            index.add_all()
+        index.write()
+        
+        tree = index.write_tree()
+        parents = [] if repo.head_is_unborn else [repo.head.target]
+        if parents and repo[parents[0]].tree_id == tree:
+            return False
+        
+        signature = repo.default_signature
+        repo.create_commit('HEAD', signature, signature, message, tree, parents)
+        return True
+    
+    def _commit_with_git(self, paths: List[str], message: str) -> Optional[bool]:
+        # Returns None if staging failed, otherwise whether a commit was made
+        if paths:
+            staged = self._stage_with_git(paths)
+        else:
+            staged = subprocess.run(['git', 'add', '.'], capture_output=True, text=True).returncode == 0
+        if not staged:
+            return None
+        
+        result = subprocess.run(['git', 'commit', '-m', message], capture_output=True, text=True)
+        return result.returncode == 0
+    
+    def _stage_with_git(self, paths: List[str]) -> bool:
+        # Like `git add .`, silently leave out files outside the worktree or
+        # ignored, since naming them to git add is an error
+        result = subprocess.run(['git', 'rev-parse', '--show-toplevel'], capture_output=True, text=True)
+        if result.returncode != 0:
+            return False
+        toplevel = result.stdout.rstrip('\n')
+        
+        workdir = Path(toplevel).resolve()
+        rel_paths = [rel_path for rel_path in (self._repo_relative(path, workdir) for path in paths)
+                     if rel_path is not None]
+        if not rel_paths:
+            return True
+        
+        # Exits 1 when nothing is ignored; tracked files are never reported
+        result = subprocess.run(['git', 'check-ignore', '--stdin', '-z'], input='\0'.join(rel_paths),
+                                capture_output=True, text=True, cwd=toplevel)
+        if result.returncode not in (0, 1):
+            return False
+        ignored = set(result.stdout.split('\0'))
+        rel_paths = [rel_path for rel_path in rel_paths if rel_path not in ignored]
+        
+        # With those filtered out, git add either stages every path or fails
+        # before writing the index
+        result = subprocess.run(
+            ['git', '--literal-pathspecs', 'add', '--pathspec-from-file=-', '--pathspec-file-nul'],
+            input='\0'.join(rel_paths), capture_output=True, text=True, cwd=toplevel
+        )
+        return result.returncode == 0
+    
+    def _repo_relative(self, path: str, workdir: Path) -> Optional[str]:
+        # Path of an existing file relative to the worktree, or None if it lies
+        # outside. Only the directory is resolved, so a symlinked file is staged
+        # as the link itself.
+        full_path = Path(path).absolute()
+        full_path = full_path.parent.resolve() / full_path.name
+        try:
+            rel_path = full_path.relative_to(workdir).as_posix()
+        except ValueError:
+            return None
+        return rel_path if full_path.is_file() else None
+    
     def run_interactive_mode(self) -> None:
         print("Starting interactive mode...")
         
-        while True:
-            print("\nDevAgent Interactive Mode")
-            print("1. Review codebase")
-            print("2. Generate patches")
-            print("3. Commit changes")
-            print("4. Exit")
-            
-            choice = input("Choose an option: ").strip()
-            
-            if choice == '1':
-                reviews = self.review_codebase()
-                self.save_reviews(reviews)
-                print("Code review completed!")
-            elif choice == '2':
-                reviews = self.review_codebase()
-                self.generate_patches(reviews)
-                print("Patches generated!")
-            elif choice == '3':
-                self.commit_changes()
-                print("Changes committed!")
-            elif choice == '4':
-                break
-            else:
-                print("Invalid option")
+        # With a watcher, repeated reviews only re-read the files that changed
+        path = Path(self.args.path)
+        if path.is_dir() and self.watch_changes():
+            print(f"Watching {path} for changes")
+        
+        # Generation of the results patches were last generated from
+        patched_generation = None
+        
+        try:
+            while True:
+                print("\nDevAgent Interactive Mode")
+                print("1. Review codebase")
+                print("2. Generate patches")
+                print("3. Commit changes")
+                print("4. Exit")
+                
+                choice = input("Choose an option: ").strip()
+                
+                if choice == '1':
+                    reviews = self.last_reviews() if self._observer is not None else self.review_codebase()
+                    self.save_reviews(reviews)
+                    print("Code review completed!")
+                elif choice == '2':
+                    # Reuse the results of option 1 instead of walking the tree again
+                    reviews = self.last_reviews()
+                    if self._reviews_generation != patched_generation:
+                        self.generate_patches(reviews)
+                        patched_generation = self._reviews_generation
+                    print("Patches generated!")
+                elif choice == '3':
+                    self.commit_changes()
+                    print("Changes committed!")
+                elif choice == '4':
+                    break
+                else:
+                    print("Invalid option")
+        finally:
+            self.stop_watching()
+
+class _ChangeHandler(FileSystemEventHandler):
+    # Forwards watchdog events under the reviewed path to DevAgent._note_change
+    def __init__(self, agent: DevAgent):
+        super().__init__()
+        self.agent = agent
+        # Reviews are keyed by the walker's paths, which start with the root as
+        # given; backends may report it absolute or with symlinks resolved
+        self.root = Path(agent.args.path)
+        self.abs_root = os.path.abspath(self.root)
+        self.real_root = os.path.realpath(self.root)
+    
+    def on_any_event(self, event) -> None:
+        if event.event_type in ('opened', 'closed', 'closed_no_write'):
+            return
+        if event.is_directory:
+            # Files under a moved or deleted directory get no events of their own
+            if event.event_type in ('moved', 'deleted'):
+                self.agent._note_change(None)
+            return
+        
+        paths = [event.src_path, event.dest_path] if event.event_type == 'moved' else [event.src_path]
+        for path in paths:
+            walk_path = self._walk_path(os.fsdecode(path))
+            if walk_path is not None:
+                self.agent._note_change(walk_path)
+    
+    def _walk_path(self, event_path: str) -> Optional[str]:
+        # The path as CodeReview.file_path spells it, or None if outside the root
+        candidates = ((os.path.abspath(event_path), self.abs_root),
+                      (os.path.realpath(event_path), self.real_root))
+        for full_path, base in candidates:
+            rel_path = os.path.relpath(full_path, base)
+            if rel_path != os.pardir and not rel_path.startswith(os.pardir + os.sep):
+                return str(self.root / rel_path)
+        return None
+
+# Per-process agent used by review_batch_worker, set up by the pool initializer
+_worker_agent: Optional[DevAgent] = None
+
+def _init_review_worker(args) -> None:
+    global _worker_agent
+    _worker_agent = DevAgent(args)
+
+def review_batch_worker(batch: List[Tuple[int, str, bytes]]) -> List[Tuple[int, CodeReview]]:
+    # Slotted reviews pickle compactly back to the parent, and suggestions shared
+    # within a batch are sent once
+    return [(index, _worker_agent.review_content(Path(file_path), data)) for index, file_path, data in batch]
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(description='DevAgent Pipeline - AI-powered code review')
@@ -269,6 +1134,8 @@ def main():
     parser.add_argument('--output', help='Output file for results')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('--interactive', action='store_true', help='Run in interactive mode')
+    parser.add_argument('--jobs', type=positive_int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the per-file review cache')
     
     args = parser.parse_args()
     
@@ -292,20 +1159,24 @@ def main():
         
         # Optionally commit changes
         if reviews:
-            agent.commit_changes()
+            agent.commit_changes(reviews)
         
         print("DevAgent pipeline completed successfully!")
         
-        # Print summary
-        total_issues = sum(len(r.issues) for r in reviews)
-        total_suggestions = sum(len(r.suggestions) for r in reviews)
-        avg_score = sum(r.score for r in reviews) / len(reviews) if reviews else 0
+        # Print summary, totalled in a single pass
+        total_issues = total_suggestions = 0
+        total_score = 0.0
+        for r in reviews:
+            total_issues += r.issue_count
+            total_suggestions += len(r.suggestions)
+            total_score += r.score
+        avg_score = total_score / len(reviews) if reviews else 0.0
         
         print("\n=== Review Summary ===")
         print(f"Files reviewed: {len(reviews)}")
         print(f"Total issues found: {total_issues}")
         print(f"Total suggestions: {total_suggestions}")
-        print(f"Average score: {avg_score:.2}")
+        print(f"Average score: {avg_score:.2f}")
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+import shutil
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+import dev_agent
+
+# Inputs where counting bytes, UTF-8 characters or line endings differently
+# would change the result
+CASES = [
+    b'a' * 120 + b'\xb0\n',
+    b'a' * 121 + b'\n',
+    b'# TODO ' + 'é'.encode('utf-8') * 119 + b'\n',
+    b'# TODO ' + 'é'.encode('utf-8') * 120 + b'\nx = "secret"',
+    b'x = 1\r# FIXME\r' + b'b' * 130 + b'\r',
+    b'x = 1\r\n"password"\r\n' + b'\xff' * 121 + b'\r\n',
+    b'a' * 200,
+    b'',
+]
+
+
+@pytest.fixture
+def agent():
+    args = SimpleNamespace(path='.', output=None, verbose=False, interactive=False, jobs=1, no_cache=True)
+    agent = dev_agent.DevAgent(args)
+    # Compare the two pure-Python-reachable scanners, not Hyperscan
+    agent._scan_db = None
+    return agent
+
+
+@pytest.mark.skipif(dev_agent.scan_bytes is None, reason='numba is not installed')
+@pytest.mark.parametrize('content', CASES)
+@pytest.mark.parametrize('ext', ['py', 'rs', 'js'])
+def test_kernel_matches_fallback(agent, monkeypatch, content, ext):
+    kernel_result = agent.scan_all(content, ext)
+    monkeypatch.setattr(dev_agent, 'scan_bytes', None)
+    assert agent.scan_all(content, ext) == kernel_result
+
+
+def git(*args, cwd=None):
+    return subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    # A repository ignoring build/, with files that must not be staged around
+    # the ones that must: ignored, outside the worktree, and glob lookalikes
+    root = tmp_path / 'repo'
+    (root / 'src' / 'build').mkdir(parents=True)
+    git('init', '-q', str(root))
+    git('config', 'user.email', 'dev@example.com', cwd=root)
+    git('config', 'user.name', 'dev', cwd=root)
+    (root / '.gitignore').write_text('build/\n')
+    git('add', '.gitignore', cwd=root)
+    git('commit', '-q', '-m', 'init', cwd=root)
+    
+    (root / 'src' / 'main.rs').write_text('fn main() {}\n')
+    (root / 'src' / 'build' / 'gen.py').write_text('x = 1\n')
+    (root / 'src' / 'a[1].py').write_text('x = 1\n')
+    (root / 'src' / 'a1.py').write_text('x = 1\n')
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    (outside / 'o.py').write_text('x = 1\n')
+    os.symlink(outside, root / 'src' / 'linked')
+    
+    monkeypatch.chdir(root / 'src')
+    return root
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+@pytest.mark.parametrize('backend', ['git', 'pygit2'])
+def test_commit_skips_ignored_and_outside_paths(agent, repo, backend):
+    if backend == 'pygit2' and dev_agent.pygit2 is None:
+        pytest.skip('pygit2 is not installed')
+    commit = agent._commit_with_git if backend == 'git' else agent._commit_with_pygit2
+    
+    paths = ['main.rs', 'build/gen.py', 'a[1].py', 'linked/o.py', str(repo.parent / 'outside' / 'o.py')]
+    assert commit(paths, 'review') is True
+    
+    committed = git('show', '--name-only', '--format=', 'HEAD', cwd=repo).split()
+    assert sorted(committed) == ['src/a[1].py', 'src/main.rs']
+    # Nothing else was left staged, and a1.py was not matched as a glob
+    assert git('diff', '--cached', '--name-only', cwd=repo) == ''
+    assert '?? src/a1.py' in git('status', '--porcelain', cwd=repo).splitlines()